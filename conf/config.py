@@ -1,12 +1,42 @@
 """Configuration constants for the Spotify Festival Playlist Generator."""
 
+import logging
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """Reads an integer from the environment, falling back to `default` on invalid values."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logging.getLogger(__name__).warning(f"Ignoring {name}={value!r}: not an integer, using {default}.")
+        return default
+
+
 # Spotify OAuth settings
 SPOTIFY_SCOPES = ["playlist-read-private", "playlist-modify-private", "playlist-modify-public"]
 SPOTIFY_REDIRECT_URI = "http://127.0.0.1:8888/callback"
+# Parallel artist lookups; the rate limiter below keeps them within Spotify's limits
+SPOTIFY_MAX_WORKERS = max(1, _env_int("FESTIFY_PARALLEL", 8))
+SPOTIFY_TOKEN_REFRESH_MARGIN = 300  # refresh tokens expiring within this many seconds at startup
+SPOTIFY_MAX_CALLS_PER_SECOND = 10  # client-side limit for Spotify Web API requests (all threads)
 
 # General project settings
 DEFAULT_TOP_N = 5
 DEFAULT_LOG_LEVEL = "INFO"
 DATA_DIR = "res/lineups"
 PLAYLIST_DIR = "res/playlists"
-LOG_DIR = "logs"
\ No newline at end of file
+LOG_DIR = "logs"
+CACHE_DIR = "res/cache"
+LINEUP_PATH_CACHE_TTL = 60  # seconds a resolved lineup file path is reused
+SCRAPER_TTL = 6 * 3600  # seconds a scraped lineup is reused by --refresh_lineup
+
+# Artist lookup cache (seconds until an entry is fetched again)
+ARTIST_CACHE_TTL = 30 * 24 * 3600
+TOP_TRACKS_CACHE_TTL = 7 * 24 * 3600
+
+# Spotify user ID cache (seconds until /me is requested again)
+USER_ID_CACHE_TTL = 30 * 24 * 3600
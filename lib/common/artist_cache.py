@@ -0,0 +1,174 @@
+"""Persistent on-disk cache for artist IDs and top tracks.
+
+Festival lineups overlap heavily between years and playlists are regenerated
+regularly, so Spotify lookups are cached in res/cache/artists.sqlite:
+    - artists:    normalized artist name -> Spotify artist ID (NULL for unknown artists)
+    - top_tracks: (artist_id, market) -> top track objects (JSON)
+
+Entries older than ARTIST_CACHE_TTL / TOP_TRACKS_CACHE_TTL are fetched again;
+with use_cache=False every entry is fetched again and overwritten.
+
+Additionally, the top track IDs per artist are stored per festival
+(res/cache/festival_{slug}_{year}.json, {artist: {"top_n": n, "ids": [...]}})
+so re-runs can skip artists whose tracks are all already in the playlist.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+
+from spotipy import Spotify
+from conf.config import CACHE_DIR, ARTIST_CACHE_TTL, TOP_TRACKS_CACHE_TTL
+from lib.common.artist_utils import get_artist_id, get_top_tracks
+from lib.common.json_utils import dumps as json_dumps, loads as json_loads
+from lib.common.utils import slug
+
+logger = logging.getLogger(__name__)
+
+_DB_FILE = "artists.sqlite"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artists (
+    name_norm TEXT PRIMARY KEY,
+    artist_id TEXT,
+    fetched_at INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS top_tracks (
+    artist_id TEXT NOT NULL,
+    market TEXT NOT NULL,
+    tracks TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL,
+    PRIMARY KEY (artist_id, market)
+);
+"""
+# Spotify returns at most 10 top tracks; caching all of them serves every top_n
+_MAX_TOP_TRACKS = 10
+
+
+# Database files whose tables were already created by this process
+_schema_ready: set[str] = set()
+_schema_lock = threading.Lock()
+
+
+def _ensure_schema(db_path: str) -> None:
+    """Create the cache directory and tables once per process."""
+    with _schema_lock:
+        if db_path in _schema_ready:
+            return
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with closing(sqlite3.connect(db_path, timeout=30)) as conn:
+            conn.executescript(_SCHEMA)
+        _schema_ready.add(db_path)
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache database (one connection per call, safe to use from worker threads)."""
+    db_path = os.path.join(CACHE_DIR, _DB_FILE)
+    if db_path not in _schema_ready:
+        _ensure_schema(db_path)
+    return sqlite3.connect(db_path, timeout=30)
+
+
+def get_or_fetch_artist_id(sp_client: Spotify, name: str, use_cache: bool = True) -> Optional[str]:
+    """
+    Returns the Spotify artist ID for `name`, searching Spotify only on a cache miss.
+
+    :param sp_client: Authenticated Spotipy client.
+    :param name: Artist name as it appears in the lineup.
+    :param use_cache: If False, ignore the cached entry and search again.
+    :return: Spotify artist ID, or None if the artist could not be found.
+    """
+    name_norm = slug(name)
+    now = int(time.time())
+    with closing(_connect()) as conn:
+        row = conn.execute(
+            "SELECT artist_id, fetched_at FROM artists WHERE name_norm = ?", (name_norm,)
+        ).fetchone() if use_cache else None
+        if row and now - row[1] < ARTIST_CACHE_TTL:
+            return row[0]
+
+        artist_id = get_artist_id(sp_client=sp_client, name=name)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO artists (name_norm, artist_id, fetched_at) VALUES (?, ?, ?)",
+                (name_norm, artist_id, now),
+            )
+    logger.debug(f"Cached artist ID for '{name}': {artist_id}")
+    return artist_id
+
+
+def get_or_fetch_top_tracks(
+    sp_client: Spotify,
+    artist_id: str,
+    limit: int = 5,
+    market: str = "US",
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Returns the top tracks of an artist, calling Spotify only on a cache miss.
+
+    :param sp_client: Authenticated Spotipy client.
+    :param artist_id: Spotify artist ID.
+    :param limit: Number of top tracks to return.
+    :param market: Market (country code) the top tracks are ranked for.
+    :param use_cache: If False, ignore the cached entry and fetch again.
+    :return: List of track objects with 'id', 'name' and 'external_urls'.
+    """
+    now = int(time.time())
+    with closing(_connect()) as conn:
+        row = conn.execute(
+            "SELECT tracks, fetched_at FROM top_tracks WHERE artist_id = ? AND market = ?", (artist_id, market)
+        ).fetchone() if use_cache else None
+        if row and now - row[1] < TOP_TRACKS_CACHE_TTL:
+            return json_loads(row[0])[:limit]
+
+        tracks = [
+            {"id": t["id"], "name": t["name"], "external_urls": t["external_urls"]}
+            for t in get_top_tracks(sp_client=sp_client, artist_id=artist_id, limit=_MAX_TOP_TRACKS, market=market)
+        ]
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO top_tracks (artist_id, market, tracks, fetched_at) VALUES (?, ?, ?, ?)",
+                (artist_id, market, json_dumps(tracks).decode("utf-8"), now),
+            )
+    return tracks[:limit]
+
+
+def _festival_cache_path(festival_slug: str, year: str) -> str:
+    return os.path.join(CACHE_DIR, f"festival_{festival_slug}_{year}.json")
+
+
+def load_festival_tracks(festival_slug: str, year: str) -> Dict[str, Any]:
+    """
+    Loads the artist -> top tracks mapping of a previous run for a festival.
+
+    :param festival_slug: Festival identifier.
+    :param year: Festival year.
+    :return: Mapping of artist name to {"top_n", "ids"} (empty if there is no usable cache);
+             files of older versions map artists to plain track ID lists.
+    """
+    path = _festival_cache_path(festival_slug, year)
+    try:
+        with open(path, "rb") as f:
+            return json_loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        logger.warning(f"Ignoring unreadable festival cache {path}: {e}")
+        return {}
+
+
+def save_festival_tracks(festival_slug: str, year: str, tracks_by_artist: Dict[str, Any]) -> None:
+    """
+    Stores the artist -> top tracks mapping for a festival.
+
+    :param festival_slug: Festival identifier.
+    :param year: Festival year.
+    :param tracks_by_artist: Mapping of artist name to {"top_n": requested count, "ids": track IDs}.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(_festival_cache_path(festival_slug, year), "wb") as f:
+        f.write(json_dumps(tracks_by_artist))
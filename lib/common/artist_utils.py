@@ -8,7 +8,7 @@ def get_artist_id(sp_client: Spotify, name: str) -> str | None:
     items = result.get("artists", {}).get("items", [])
     return items[0]["id"] if items else None
 
-def get_top_tracks(sp_client: Spotify, artist_id: str, limit: int = 5) -> list[str]:
-    """Returns the IDs of the top tracks for a given artist."""
-    tracks = sp_client.artist_top_tracks(artist_id).get("tracks", [])
-    return [t["id"] for t in tracks[:limit]]
+def get_top_tracks(sp_client: Spotify, artist_id: str, limit: int = 5, market: str = "US") -> list[dict]:
+    """Returns the top track objects (id, name, external_urls, ...) for a given artist."""
+    tracks = sp_client.artist_top_tracks(artist_id, country=market).get("tracks", [])
+    return tracks[:limit]
@@ -7,24 +7,26 @@ Exports ensure consistent naming and structure:
 """
 
 import csv
-import json
+import io
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, List, Dict
 
+from lib.common.json_utils import dumps as json_dumps
+
+logger = logging.getLogger(__name__)
+
+# Separators that become underscores in export filenames
+_SEPARATORS = str.maketrans({"·": "_", " ": "_", ".": "_", "-": "_"})
+# Anything that is not alphanumeric or an underscore (\w matches str.isalnum() plus "_")
+_NON_WORD_RE = re.compile(r"\W+")
+
 
 def _sanitize_name(name: str) -> str:
     """Normalize a playlist or festival name into a safe lowercase filename."""
-    safe = (
-        name.replace("·", "_")
-        .replace("·", "_")
-        .replace(" ", "_")
-        .replace("·", "_")
-        .replace("Festify", "festify")
-        .replace(".", "_")
-        .replace("-", "_")
-    )
-    return "".join(c for c in safe if c.isalnum() or c == "_").strip("_").lower()
+    return _NON_WORD_RE.sub("", name.translate(_SEPARATORS)).strip("_").lower()
 
 
 def _ensure_directory(base_dir: str, festival_slug: str, year: str) -> Path:
@@ -34,6 +36,30 @@ def _ensure_directory(base_dir: str, festival_slug: str, year: str) -> Path:
     return path
 
 
+def _write_csv(csv_path: Path, data: List[Dict[str, Any]]) -> None:
+    """Write rows to a CSV file; errors are logged, not raised."""
+    try:
+        # Build the file in memory and write it with a single call
+        fields = list(data[0].keys())
+        buffer = io.StringIO(newline="")
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        writer.writerows([row[k] for k in fields] for row in data)
+        csv_path.write_text(buffer.getvalue(), encoding="utf-8", newline="")
+        logger.info(f"Exported CSV: {csv_path}")
+    except Exception as e:
+        logger.error(f"Failed to export CSV ({csv_path}): {e}")
+
+
+def _write_json(json_path: Path, data: List[Dict[str, Any]]) -> None:
+    """Write rows to a JSON file; errors are logged, not raised."""
+    try:
+        json_path.write_bytes(json_dumps(data, indent=True))
+        logger.info(f"Exported JSON: {json_path}")
+    except Exception as e:
+        logger.error(f"Failed to export JSON ({json_path}): {e}")
+
+
 def export_playlist(
     playlist_name: str,
     data: List[Dict[str, Any]],
@@ -59,26 +85,12 @@ def export_playlist(
     year : str
         Festival year.
     """
-    logger = logging.getLogger(__name__)
     export_path = _ensure_directory(base_dir=export_dir, festival_slug=festival_slug, year=year)
     filename = _sanitize_name(playlist_name)
     csv_path = export_path / f"{filename}.csv"
     json_path = export_path / f"{filename}.json"
 
-    # Write CSV
-    try:
-        with open(csv_path, mode="w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=data[0].keys())
-            writer.writeheader()
-            writer.writerows(data)
-        logger.info(f"Exported CSV: {csv_path}")
-    except Exception as e:
-        logger.error(f"Failed to export CSV ({csv_path}): {e}")
-
-    # Write JSON
-    try:
-        with open(json_path, mode="w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        logger.info(f"Exported JSON: {json_path}")
-    except Exception as e:
-        logger.error(f"Failed to export JSON ({json_path}): {e}")
+    # Both files are independent, so write them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        executor.submit(_write_csv, csv_path, data)
+        executor.submit(_write_json, json_path, data)
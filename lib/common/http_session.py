@@ -0,0 +1,29 @@
+"""Shared HTTP session for the festival scrapers.
+
+All scrapers use the same keep-alive session, so repeated requests to a host reuse
+the open TCP/TLS connection. Transient errors (429/5xx) are retried with backoff.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "spotify-festival-playlist-generator/0.1.0"
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+SESSION = _build_session()
@@ -0,0 +1,28 @@
+"""JSON helpers that use orjson when it is installed and fall back to the standard library.
+
+orjson is an optional speed-up (pip install ".[fast]"); results are identical either way:
+    - dumps() returns UTF-8 encoded bytes with non-ASCII characters kept as-is.
+    - loads() accepts bytes or str.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize `data` to UTF-8 JSON bytes, pretty-printed with two spaces if `indent` is set."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def loads(raw: bytes | str) -> Any:
+    """Parse a JSON document; raises ValueError on invalid input."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
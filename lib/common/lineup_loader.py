@@ -2,9 +2,15 @@
 
 import os
 import csv
-import json
 import logging
 from pathlib import Path
+from typing import List
+
+from lib.common.json_utils import loads as json_loads
+
+__all__ = ["load_lineup_from_csv", "load_lineup_from_json", "fetch_lineup"]
+
+logger = logging.getLogger(__name__)
 
 
 def load_lineup_from_csv(file_path: str) -> list[str]:
@@ -14,21 +20,24 @@ def load_lineup_from_csv(file_path: str) -> list[str]:
     :param file_path: Relative or absolute path to the CSV file.
     :return: List of artist names.
     """
-    logger = logging.getLogger(__name__)
-    abs_path = Path(file_path).resolve()
-
-    if not abs_path.exists():
-        logger.error(f"Lineup file not found: {abs_path}")
-        raise FileNotFoundError(f"Lineup file not found: {abs_path}")
-
-    with abs_path.open(encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        if "artist" not in reader.fieldnames:
+    path = Path(file_path)
+    try:
+        csvfile = path.open(encoding="utf-8", newline="")
+    except FileNotFoundError:
+        logger.error(f"Lineup file not found: {path}")
+        raise
+
+    with csvfile:
+        # Plain csv.reader with a header index avoids building a dict per row
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        if "artist" not in header:
             logger.error("CSV must contain an 'artist' column header.")
             raise ValueError("CSV must contain an 'artist' column header.")
 
-        artists = [row["artist"].strip() for row in reader if row.get("artist")]
-        logger.info(f"Loaded {len(artists)} artists from CSV → {abs_path}")
+        idx = header.index("artist")
+        artists = [row[idx].strip() for row in reader if len(row) > idx and row[idx]]
+        logger.info(f"Loaded {len(artists)} artists from CSV → {path}")
         return artists
 
 
@@ -40,29 +49,28 @@ def load_lineup_from_json(file_path: str) -> list[str]:
     :param file_path: Relative or absolute path to the JSON file.
     :return: List of artist names.
     """
-    logger = logging.getLogger(__name__)
-    abs_path = Path(file_path).resolve()
-
-    if not abs_path.exists():
-        logger.error(f"Lineup JSON not found: {abs_path}")
-        raise FileNotFoundError(f"Lineup JSON not found: {abs_path}")
-
-    with abs_path.open(encoding="utf-8") as f:
-        data = json.load(f)
-
-    if isinstance(data, list):
-        if all(isinstance(entry, dict) and "artist" in entry for entry in data):
-            artists = [entry["artist"].strip() for entry in data if entry.get("artist")]
-        elif all(isinstance(entry, str) for entry in data):
-            artists = [entry.strip() for entry in data if entry]
-        else:
-            logger.error("JSON must be a list of dicts with 'artist' or list of strings.")
-            raise ValueError("Invalid JSON structure for lineup.")
-    else:
+    path = Path(file_path)
+    try:
+        data = json_loads(path.read_bytes())
+    except FileNotFoundError:
+        logger.error(f"Lineup JSON not found: {path}")
+        raise
+
+    if not isinstance(data, list):
         logger.error("JSON must contain a list at the root level.")
         raise ValueError("Invalid JSON format.")
 
-    logger.info(f"Loaded {len(artists)} artists from JSON → {abs_path}")
+    # The first entry decides the layout; no full scans of the list up front
+    first = data[0] if data else ""
+    if isinstance(first, dict):
+        artists = [entry["artist"].strip() for entry in data if entry.get("artist")]
+    elif isinstance(first, str):
+        artists = [entry.strip() for entry in data if entry]
+    else:
+        logger.error("JSON must be a list of dicts with 'artist' or list of strings.")
+        raise ValueError("Invalid JSON structure for lineup.")
+
+    logger.info(f"Loaded {len(artists)} artists from JSON → {path}")
     return artists
 
 def fetch_lineup(file_path: str) -> List[str]:
@@ -79,10 +87,7 @@ def fetch_lineup(file_path: str) -> List[str]:
         FileNotFoundError: If the file does not exist.
         ValueError: If the file format is unsupported.
     """
-    logger = logging.getLogger(__name__)
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Lineup file not found: {file_path}")
-
+    # No separate exists() check: the loaders raise FileNotFoundError when opening
     if file_path.lower().endswith(".csv"):
         logger.info(f"Loading lineup from CSV: {file_path}")
         return load_lineup_from_csv(file_path=file_path)
@@ -1,16 +1,31 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 
+_listener: logging.handlers.QueueListener | None = None
+
+
 def setup_logger(level: str = "INFO", log_dir: str = "logs", quiet: bool = False) -> None:
     """
     Sets up a root logger for the entire project.
     In quiet mode, only file logging is active (no console output).
 
+    Log records are handed to a queue and written by a background listener thread,
+    so logging calls never block on file or console I/O. Like logging.basicConfig,
+    this is a no-op if the root logger is already configured.
+
     :param level: Logging level (e.g., "INFO", "DEBUG", "ERROR").
     :param log_dir: Directory for log files.
     :param quiet: If True, disables console StreamHandler.
     """
+    global _listener
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
     os.makedirs(log_dir, exist_ok=True)
     log_file = os.path.join(log_dir, "app.log")
 
@@ -18,11 +33,17 @@ def setup_logger(level: str = "INFO", log_dir: str = "logs", quiet: bool = False
     if not quiet:
         handlers.append(logging.StreamHandler(stream=sys.stderr))
 
-    logging.basicConfig(
-        level=getattr(logging, level.upper(), logging.INFO),
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        handlers=handlers,
-    )
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)  # flushes pending records on exit
 
 def get_logger(name: str) -> logging.Logger:
     """Returns a configured logger instance."""
@@ -9,62 +9,153 @@ Note:
 """
 
 import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import date
 from tqdm import tqdm
 import logging
-from typing import Iterable, Optional, Set, Dict, Any
+from typing import Iterable, List, Optional, Set, FrozenSet, Dict, Any, Tuple
 from spotipy import Spotify
+from spotipy.exceptions import SpotifyException
+from conf.config import SPOTIFY_MAX_WORKERS
 from lib.common.utils import slug
-from lib.common.artist_utils import get_artist_id, get_top_tracks
+from lib.common.artist_cache import (
+    get_or_fetch_artist_id,
+    get_or_fetch_top_tracks,
+    load_festival_tracks,
+    save_festival_tracks,
+)
 from lib.common.export_utils import export_playlist
-from lib.common.spotify_client import create_spotify_client
-
-
-def find_playlist_by_name(sp_client: Spotify, user_id: str, name: str) -> Optional[Dict[str, Any]]:
-    """Return the user's playlist dict if a playlist with `name` exists, else None."""
-    logger = logging.getLogger(__name__)
+from lib.common.spotify_client import call_with_backoff
+
+__all__ = [
+    "list_all_playlists",
+    "find_playlist_by_name",
+    "create_playlist",
+    "get_playlist_track_ids",
+    "add_tracks",
+    "ensure_playlist",
+    "delete_playlists_by_prefix",
+    "set_playlist_description",
+    "generate_festival_playlist",
+]
+
+logger = logging.getLogger(__name__)
+
+# Playlist listings per client (keyed by id(sp_client)), kept in sync on create/delete
+_playlist_cache: Dict[int, List[Dict[str, Any]]] = {}
+# Per-client lookup index (owner_id, name) -> playlist, built alongside _playlist_cache
+_playlists_by_name: Dict[int, Dict[Tuple[str, str], Dict[str, Any]]] = {}
+_playlist_cache_lock = threading.Lock()
+# Guards the per-run top-tracks memo shared by the artist workers
+_top_cache_lock = threading.Lock()
+
+
+def _playlist_key(pl: Dict[str, Any]) -> Tuple[str, str]:
+    return pl.get("owner", {}).get("id"), pl.get("name")
+
+
+def _iter_all_playlists(sp_client: Spotify) -> List[Dict[str, Any]]:
+    """Return all playlists of the current user, paginating only on the first call per client."""
+    cached = _playlist_cache.get(id(sp_client))
+    if cached is not None:
+        return cached
+    # Festivals may be processed in parallel; only one thread pages through the library
+    with _playlist_cache_lock:
+        cached = _playlist_cache.get(id(sp_client))
+        if cached is not None:
+            return cached
+        return _load_all_playlists(sp_client)
+
+
+def _load_all_playlists(sp_client: Spotify) -> List[Dict[str, Any]]:
+    """Page through current_user_playlists and fill both caches (caller holds the lock)."""
+    playlists: List[Dict[str, Any]] = []
     limit = 50
     offset = 0
     while True:
-        page = sp_client.current_user_playlists(limit=limit, offset=offset)
+        page = call_with_backoff(sp_client.current_user_playlists, limit=limit, offset=offset)
         items = page.get("items", [])
-        for pl in items:
-            if pl.get("name") == name and pl.get("owner", {}).get("id") == user_id:
-                logger.info(f"Found existing playlist: {name} ({pl.get('id')})")
-                return pl
+        playlists.extend(items)
         if len(items) < limit:
             break
         offset += limit
+
+    by_name: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for pl in playlists:
+        by_name.setdefault(_playlist_key(pl), pl)  # first match wins, as with a linear scan
+    # Publish the index first: readers check _playlist_cache without taking the lock
+    _playlists_by_name[id(sp_client)] = by_name
+    _playlist_cache[id(sp_client)] = playlists
+    return playlists
+
+
+def _forget_playlist(sp_client: Spotify, pl: Dict[str, Any]) -> None:
+    """Remove a playlist from the cached listing and name index."""
+    _iter_all_playlists(sp_client).remove(pl)
+    by_name = _playlists_by_name[id(sp_client)]
+    key = _playlist_key(pl)
+    if by_name.get(key) is pl:
+        del by_name[key]
+        # Fall back to another playlist with the same owner and name, if any
+        for other in _playlist_cache[id(sp_client)]:
+            if _playlist_key(other) == key:
+                by_name[key] = other
+                break
+
+
+def list_all_playlists(sp_client: Spotify) -> List[Dict[str, Any]]:
+    """Return all playlists of the current user (a copy of the cached listing)."""
+    return list(_iter_all_playlists(sp_client))
+
+
+def find_playlist_by_name(sp_client: Spotify, user_id: str, name: str) -> Optional[Dict[str, Any]]:
+    """Return the user's playlist dict if a playlist with `name` exists, else None."""
+    _iter_all_playlists(sp_client)
+    pl = _playlists_by_name[id(sp_client)].get((user_id, name))
+    if pl:
+        logger.info(f"Found existing playlist: {name} ({pl.get('id')})")
+        return pl
     logger.info(f"No existing playlist named '{name}' found for user {user_id}.")
     return None
 
 
 def create_playlist(sp_client: Spotify, user_id: str, name: str, description: str) -> Dict[str, Any]:
     """Create a new playlist with the given name and description."""
-    logger = logging.getLogger(__name__)
     logger.info(f"Creating new playlist: {name}")
-    return sp_client.user_playlist_create(user=user_id, name=name, public=False, description=description)
+    playlist = call_with_backoff(
+        sp_client.user_playlist_create, user=user_id, name=name, public=False, description=description
+    )
+    _iter_all_playlists(sp_client).append(playlist)
+    _playlists_by_name[id(sp_client)].setdefault(_playlist_key(playlist), playlist)
+    return playlist
 
 
-def get_playlist_track_ids(sp_client: Spotify, playlist_id: str) -> Set[str]:
-    """Return a set of all track IDs currently in the playlist (handles pagination)."""
-    logger = logging.getLogger(__name__)
+def get_playlist_track_ids(sp_client: Spotify, playlist_id: str) -> FrozenSet[str]:
+    """Return a frozenset of all track IDs currently in the playlist (handles pagination)."""
     track_ids: Set[str] = set()
     limit = 100
     offset = 0
     while True:
-        page = sp_client.playlist_items(playlist_id=playlist_id, limit=limit, offset=offset)
+        # Only request the track IDs; full track objects are many times larger
+        page = call_with_backoff(
+            sp_client.playlist_items,
+            playlist_id=playlist_id,
+            fields="items(track(id)),next",
+            limit=limit,
+            offset=offset,
+        )
         items = page.get("items", [])
         for it in items:
             track = it.get("track") or {}
             tid = track.get("id")
             if tid:
                 track_ids.add(tid)
-        if len(items) < limit:
+        if not page.get("next"):
             break
         offset += limit
     logger.info(f"Collected {len(track_ids)} existing track IDs from playlist {playlist_id}.")
-    return track_ids
+    return frozenset(track_ids)
 
 
 def add_tracks(sp_client: Spotify, playlist_id: str, track_ids: Iterable[str]) -> None:
@@ -72,10 +163,9 @@ def add_tracks(sp_client: Spotify, playlist_id: str, track_ids: Iterable[str]) -
     batch = list(track_ids)
     if not batch:
         return
-    logger = logging.getLogger(__name__)
     for i in range(0, len(batch), 100):
         chunk = batch[i:i + 100]
-        sp_client.playlist_add_items(playlist_id=playlist_id, items=chunk)
+        call_with_backoff(sp_client.playlist_add_items, playlist_id=playlist_id, items=chunk)
 
 
 def ensure_playlist(sp_client: Spotify, user_id: str, name: str, description: str) -> Dict[str, Any]:
@@ -91,24 +181,22 @@ def delete_playlists_by_prefix(sp_client: Spotify, user_id: str, prefix: str) ->
     Entfernt alle Playlists des Nutzers, deren Name mit `prefix` beginnt.
     Gibt die Anzahl der entfernten Playlists zurück.
     """
-    logger = logging.getLogger(__name__)
+    targets = [
+        pl for pl in _iter_all_playlists(sp_client)
+        if pl.get("name", "").startswith(prefix) and pl.get("owner", {}).get("id") == user_id
+    ]
+
+    # Unfollow requests are independent of each other, so send them in parallel
     removed = 0
-    limit = 50
-    offset = 0
-    while True:
-        page = sp_client.current_user_playlists(limit=limit, offset=offset)
-        items = page.get("items", [])
-        for pl in items:
-            name = pl.get("name", "")
-            pid = pl.get("id")
-            owner = pl.get("owner", {}).get("id")
-            if name.startswith(prefix) and owner == user_id:
-                sp_client.current_user_unfollow_playlist(pid)
-                logger.info(f"Entfernt Playlist: {name} ({pid})")
-                removed += 1
-        if len(items) < limit:
-            break
-        offset += limit
+    with ThreadPoolExecutor(max_workers=SPOTIFY_MAX_WORKERS) as executor:
+        unfollowed = executor.map(
+            lambda pl: call_with_backoff(sp_client.current_user_unfollow_playlist, pl.get("id")),
+            targets,
+        )
+        for pl, _ in zip(targets, unfollowed):
+            _forget_playlist(sp_client, pl)
+            logger.info(f"Entfernt Playlist: {pl.get('name')} ({pl.get('id')})")
+            removed += 1
     logger.info(f"Entfernte insgesamt {removed} Playlists mit Prefix '{prefix}'.")
     return removed
 
@@ -121,7 +209,62 @@ def set_playlist_description(spotify_client, user_id, playlist_id, description):
     :param playlist_id: ID der Playlist
     :param description: Beschreibungstext
     """
-    spotify_client.user_playlist_change_details(user=user_id, playlist_id=playlist_id, description=description)
+    call_with_backoff(
+        spotify_client.user_playlist_change_details, user=user_id, playlist_id=playlist_id, description=description
+    )
+
+def _is_complete(entry: Any, top_n: int, existing_track_ids: FrozenSet[str]) -> bool:
+    """
+    True if a festival cache entry covers `top_n` tracks and all of them are in the playlist.
+
+    An entry fetched with a top_n at least as large is complete even with fewer IDs:
+    the artist simply has no more top tracks.
+    """
+    if isinstance(entry, dict):
+        ids, fetched_n = entry.get("ids", []), entry.get("top_n", 0)
+    else:  # plain ID list written by older versions
+        ids, fetched_n = entry, len(entry)
+    return fetched_n >= top_n and set(ids[:top_n]) <= existing_track_ids
+
+
+def _process_artist(
+    sp_client: Spotify,
+    artist: str,
+    top_n: int,
+    use_cache: bool = True,
+    top_cache: Optional[Dict[str, Future]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Resolve an artist on Spotify and return its top tracks (empty if the artist is unknown).
+
+    Lineup entries resolving to the same artist ID share one top-tracks lookup via `top_cache`.
+    A Spotify API error skips the artist like an unknown one, so the rest of the festival
+    is still added; the artist is looked up again on the next run.
+    """
+    try:
+        artist_id = call_with_backoff(get_or_fetch_artist_id, sp_client=sp_client, name=artist, use_cache=use_cache)
+        if not artist_id:
+            return []
+        if top_cache is None:
+            top_cache = {}
+
+        with _top_cache_lock:
+            future = top_cache.get(artist_id)
+            owner = future is None
+            if owner:
+                future = top_cache[artist_id] = Future()
+        if owner:
+            try:
+                future.set_result(call_with_backoff(
+                    get_or_fetch_top_tracks,
+                    sp_client=sp_client, artist_id=artist_id, limit=top_n, use_cache=use_cache,
+                ))
+            except BaseException as e:
+                future.set_exception(e)
+        return future.result()
+    except SpotifyException as e:
+        logger.warning(f"Skipping '{artist}': Spotify lookup failed (HTTP {e.http_status}): {e.msg}")
+        return []
 
 def generate_festival_playlist(
     sp_client,
@@ -131,7 +274,8 @@ def generate_festival_playlist(
     year,
     top_n=3,
     export_dir="res/playlists",
-    quiet=False
+    quiet=False,
+    use_cache=True
 ):
     """
     Creates or updates a festival playlist on Spotify and exports track data.
@@ -145,6 +289,7 @@ def generate_festival_playlist(
         top_n: Number of top tracks per artist to add.
         export_dir: Directory to export playlist data.
         quiet: If True, suppresses info logging.
+        use_cache: If False, ignore cached artist lookups and results of previous runs.
 
     Returns:
         Tuple of (playlist title, number of new tracks added).
@@ -157,7 +302,6 @@ def generate_festival_playlist(
         f"as of {date.today().isoformat()}. It is updated sporadically."
     )
 
-    logger = logging.getLogger(__name__)
     if not quiet:
         logger.info(f"Target playlist name resolved: {playlist_title}")
 
@@ -168,31 +312,75 @@ def generate_festival_playlist(
         name=playlist_title,
         description=playlist_description
     )
-    set_playlist_description(sp_client, user_id, playlist["id"], playlist_description)
+    if playlist.get("description") != playlist_description:
+        set_playlist_description(sp_client, user_id, playlist["id"], playlist_description)
+        playlist["description"] = playlist_description
     playlist_id = playlist["id"]
     existing_track_ids = get_playlist_track_ids(sp_client, playlist_id)
 
-    new_track_ids = set()
+    all_fresh_ids: List[str] = []
     export_data = []
 
-    # Process each artist in the lineup
-    for artist in tqdm(lineup, desc=f"Processing {festival_name.strip().title()}", unit="artist", ncols=100, leave=True):
-        artist_id = get_artist_id(sp_client=sp_client, name=artist)
-        if not artist_id:
-            continue
-        top_tracks = get_top_tracks(sp_client=sp_client, artist_id=artist_id, limit=top_n)
-        fresh_ids = [tid for tid in top_tracks if tid and tid not in existing_track_ids and tid not in new_track_ids]
-        if fresh_ids:
-            add_tracks(sp_client=sp_client, playlist_id=playlist_id, track_ids=fresh_ids)
-            for tid in fresh_ids:
-                tr = sp_client.track(tid)
+    # Skip artists whose top tracks (from the last run) are all in the playlist already
+    festival_tracks = load_festival_tracks(fest_slug, year) if use_cache else {}
+    # Artists playing several days/stages appear more than once; keep the first spelling
+    unique_lineup: Dict[str, str] = {}
+    for artist in lineup:
+        artist = artist.strip()
+        if artist:
+            unique_lineup.setdefault(artist.lower(), artist)
+    lineup = list(unique_lineup.values())
+    pending = [
+        artist for artist in lineup
+        if artist not in festival_tracks or not _is_complete(festival_tracks[artist], top_n, existing_track_ids)
+    ]
+    if not quiet and len(pending) < len(lineup):
+        logger.info(f"Skipping {len(lineup) - len(pending)} artists already complete in the playlist.")
+
+    # Look up all artists in parallel; the lookups are independent and network-bound.
+    # The bar advances as lookups finish; results keep their lineup position.
+    results: List[List[Dict[str, Any]]] = [[] for _ in pending]
+    top_cache: Dict[str, Future] = {}  # artist ID -> top tracks, for aliases within this run
+    with ThreadPoolExecutor(max_workers=SPOTIFY_MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(_process_artist, sp_client, artist, top_n, use_cache, top_cache): idx
+            for idx, artist in enumerate(pending)
+        }
+        for future in tqdm(
+            as_completed(futures),
+            total=len(futures),
+            desc=f"Processing {festival_name.strip().title()}",
+            unit="artist",
+            ncols=100,
+            leave=True,
+            mininterval=0.5,  # redraw at most twice per second
+            smoothing=0,
+        ):
+            results[futures[future]] = future.result()
+
+    # Merge results in lineup order so the playlist order stays deterministic.
+    # One set of playlist + already added IDs means a single lookup per track.
+    seen = set(existing_track_ids)
+    for artist, top_tracks in zip(pending, results):
+        if top_tracks:
+            festival_tracks[artist] = {"top_n": top_n, "ids": [tr["id"] for tr in top_tracks if tr.get("id")]}
+        fresh_tracks = [tr for tr in top_tracks if tr.get("id") and tr["id"] not in seen]
+        if fresh_tracks:
+            fresh_ids = [tr["id"] for tr in fresh_tracks]
+            all_fresh_ids.extend(fresh_ids)
+            # The top-track objects already carry name and URL, no extra lookup needed
+            for tr in fresh_tracks:
                 export_data.append({
                     "artist": artist,
                     "track_name": tr["name"],
-                    "track_id": tid,
+                    "track_id": tr["id"],
                     "spotify_url": tr["external_urls"]["spotify"],
                 })
-            new_track_ids.update(fresh_ids)
+            seen.update(fresh_ids)
+
+    # One add request per 100 tracks instead of one per artist
+    add_tracks(sp_client=sp_client, playlist_id=playlist_id, track_ids=all_fresh_ids)
+    save_festival_tracks(fest_slug, year, festival_tracks)
 
     # Export playlist data if new tracks were added
     if export_data:
@@ -206,33 +394,6 @@ def generate_festival_playlist(
         )
 
     if not quiet:
-        logger.info(f"Done: {playlist_title} (+{len(new_track_ids)} new tracks)")
-    return playlist_title, len(new_track_ids)
-
-
-if __name__ == "__main__":
-
-    sp = create_spotify_client()
-    user_id = sp.current_user()["id"]
-    prefix = "Festify ·"
-
-    # Debug-Ausgabe: Zeige alle Playlists mit Name, Owner und ID
-    print("Gefundene Playlists:")
-    limit = 50
-    offset = 0
-    while True:
-        page = sp.current_user_playlists(limit=limit, offset=offset)
-        items = page.get("items", [])
-        print(f"Offset: {offset}, Anzahl Playlists auf Seite: {len(items)}")  # <-- Hier einfügen
-        for pl in items:
-            name = pl.get("name", "")
-            pid = pl.get("id")
-            owner = pl.get("owner", {}).get("id")
-            print(f"Name='{name}', Owner='{owner}', ID='{pid}'")
-        if len(items) < limit:
-            break
-        offset += limit
+        logger.info(f"Done: {playlist_title} (+{len(all_fresh_ids)} new tracks)")
+    return playlist_title, len(all_fresh_ids)
 
-    # Löschen der Playlists mit passendem Prefix
-    deleted = delete_playlists_by_prefix(sp, user_id, prefix)
-    print(f"Entfernte {deleted} Playlists mit Prefix '{prefix}'.")
@@ -1,34 +1,215 @@
 """Handles Spotify API authentication and client creation with persistent caching."""
 
+import hashlib
 import os
+import time
 import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Callable
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 from spotipy import Spotify
+from spotipy.exceptions import SpotifyException
 from spotipy.oauth2 import SpotifyOAuth
-from conf.config import SPOTIFY_SCOPES, SPOTIFY_REDIRECT_URI
+from urllib3.util.retry import Retry
+from conf.config import (
+    SPOTIFY_SCOPES, SPOTIFY_REDIRECT_URI, SPOTIFY_TOKEN_REFRESH_MARGIN, SPOTIFY_MAX_CALLS_PER_SECOND,
+    CACHE_DIR, USER_ID_CACHE_TTL
+)
+from lib.common.json_utils import dumps as json_dumps, loads as json_loads
 from lib.common.logger import setup_logger
 
+logger = logging.getLogger(__name__)
 
-# ---------------------------------------------------------------------------
-# Load .env exactly once from the project root (two levels up from this file)
-# ---------------------------------------------------------------------------
-dotenv_path = Path(__file__).resolve().parents[2] / ".env"
-load_dotenv(dotenv_path=dotenv_path)
 
+# Start times of the Spotify requests sent within the last second (shared by all threads)
+_rate_lock = threading.Lock()
+_recent_calls: deque[float] = deque()
+_paused_until = 0.0
 
-def create_spotify_client(cache_path: str = ".cache-spotify") -> Spotify:
+
+def _throttle() -> None:
     """
-    Creates and returns an authenticated Spotify client instance.
+    Blocks until another request fits into SPOTIFY_MAX_CALLS_PER_SECOND.
+
+    Also waits out a Retry-After pause announced by any thread, so all workers back off
+    together instead of each one running into the rate limit on its own.
+    """
+    while True:
+        with _rate_lock:
+            now = time.monotonic()
+            while _recent_calls and now - _recent_calls[0] >= 1.0:
+                _recent_calls.popleft()
+            wait = _paused_until - now
+            if wait <= 0:
+                if len(_recent_calls) < SPOTIFY_MAX_CALLS_PER_SECOND:
+                    _recent_calls.append(now)
+                    return
+                wait = 1.0 - (now - _recent_calls[0])
+        time.sleep(wait)
+
+
+def _pause_requests(seconds: float) -> None:
+    """
+    Holds back all Spotify requests for `seconds` (e.g. after HTTP 429).
+    """
+    global _paused_until
+    with _rate_lock:
+        _paused_until = max(_paused_until, time.monotonic() + seconds)
+
+
+class _ThrottledAdapter(HTTPAdapter):
+    """HTTPAdapter that passes every outgoing request through _throttle()."""
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        _throttle()
+        return super().send(request, *args, **kwargs)
+
+
+def _build_requests_session() -> requests.Session:
+    """
+    Builds a keep-alive HTTP session for Spotipy.
+
+    The connection pool is large enough for the parallel artist workers, so API calls
+    reuse open TLS connections instead of reconnecting. Server errors (5xx) are retried
+    with backoff. Requests are limited to SPOTIFY_MAX_CALLS_PER_SECOND across all threads.
+
+    HTTP 429 is deliberately not retried here: urllib3 would retry it per thread without
+    passing _throttle() again. It reaches call_with_backoff instead, which pauses all
+    threads for Spotify's Retry-After value.
+    """
+    retry = Retry(
+        total=5,
+        read=False,
+        allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+        backoff_factor=0.3,
+        status_forcelist=[500, 502, 503, 504],
+        respect_retry_after_header=False,  # otherwise urllib3 still retries 429 itself
+    )
+    adapter = _ThrottledAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+
+# Authenticated clients per token cache file: cache_path -> (client, user_id, token expires_at)
+_CLIENT_CACHE: dict[str, tuple[Spotify, str, float]] = {}
+
+# User IDs per app (client ID) and account (refresh token), persisted so new processes skip /me
+_USER_CACHE_FILE = os.path.join(CACHE_DIR, "spotify_user.json")
+_user_cache_lock = threading.Lock()
+
+# Token requests currently in progress, so parallel workers share a single refresh
+_refresh_lock = threading.Lock()
+_refresh_inflight: dict[tuple, Future] = {}
+
+
+def _single_flight_token(auth_manager: SpotifyOAuth, cache_path: str) -> None:
+    """
+    Wraps auth_manager.get_access_token so concurrent callers wait for one token request.
+
+    Without this, every worker thread hitting an expired token triggers its own refresh
+    round-trip to accounts.spotify.com.
+    """
+    original = auth_manager.get_access_token
+
+    def get_access_token(*args: Any, **kwargs: Any) -> Any:
+        key = (cache_path, args, tuple(sorted(kwargs.items())))
+        with _refresh_lock:
+            future = _refresh_inflight.get(key)
+            owner = future is None
+            if owner:
+                future = _refresh_inflight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            token = original(*args, **kwargs)
+            future.set_result(token)
+            return token
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _refresh_lock:
+                _refresh_inflight.pop(key, None)
+
+    auth_manager.get_access_token = get_access_token
+
+
+def _user_cache_key(client_id: str, token: dict | None) -> str | None:
+    """
+    Builds the user cache key; the hashed refresh token ties the entry to the logged-in account.
+    """
+    if not token or not token.get("refresh_token"):
+        return None
+    account = hashlib.sha256(token["refresh_token"].encode("utf-8")).hexdigest()[:16]
+    return f"{client_id}:{account}"
+
+
+def _load_cached_user_id(key: str) -> str | None:
+    """
+    Returns the user ID stored under `key`, if it is younger than USER_ID_CACHE_TTL.
+    """
+    try:
+        with open(_USER_CACHE_FILE, "rb") as f:
+            entries = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    entry = entries.get(key) if isinstance(entries, dict) else None
+    if entry and time.time() - entry.get("fetched_at", 0) < USER_ID_CACHE_TTL:
+        return entry["user_id"]
+    return None
+
+
+def _store_user_id(key: str, user_id: str) -> None:
+    """
+    Persists the user ID under `key`; outdated entries are dropped.
+    """
+    now = time.time()
+    with _user_cache_lock:
+        try:
+            with open(_USER_CACHE_FILE, "rb") as f:
+                entries = json_loads(f.read())
+        except (OSError, ValueError):
+            entries = {}
+        entries = {k: v for k, v in entries.items() if now - v.get("fetched_at", 0) < USER_ID_CACHE_TTL}
+        entries[key] = {"user_id": user_id, "fetched_at": now}
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(_USER_CACHE_FILE, "wb") as f:
+                f.write(json_dumps(entries))
+        except OSError as e:
+            logger.warning(f"Could not write user cache {_USER_CACHE_FILE}: {e}")
+
+
+def _get_or_build(cache_path: str) -> tuple[Spotify, str]:
+    """
+    Returns the memoised (client, user_id) for `cache_path`, authenticating only once.
+
+    A cached client is reused until one minute before its access token expires;
+    afterwards the client is rebuilt. The user ID is requested from Spotify (/me) at most
+    once per USER_ID_CACHE_TTL for a client ID and account, also across processes.
 
     :param cache_path: Path for the token cache file.
-    :return: Authenticated spotipy.Spotify instance.
+    :return: Tuple of authenticated spotipy.Spotify instance and user ID.
     """
+    cached = _CLIENT_CACHE.get(cache_path)
+    if cached and time.time() < cached[2] - 60:
+        return cached[0], cached[1]
+
     setup_logger(level="INFO")  # ensures consistent logging across modules
-    logger = logging.getLogger(__name__)
     logger.info("Initializing Spotify client...")
 
-    # Environment variables (already loaded by load_dotenv above)
+    # Load .env from the project root (two levels up from this file) unless already configured
+    if not os.getenv("SPOTIPY_CLIENT_ID"):
+        load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
+
     client_id = os.getenv("SPOTIPY_CLIENT_ID")
     client_secret = os.getenv("SPOTIPY_CLIENT_SECRET")
     redirect_uri = os.getenv("SPOTIPY_REDIRECT_URI", SPOTIFY_REDIRECT_URI)
@@ -45,11 +226,42 @@ def create_spotify_client(cache_path: str = ".cache-spotify") -> Spotify:
         cache_path=cache_path,
         open_browser=True,
     )
+    _single_flight_token(auth_manager, cache_path)
+
+    # Refresh a token that is about to expire now instead of during the first API calls
+    token = auth_manager.get_cached_token()
+    if token and token["expires_at"] - time.time() < SPOTIFY_TOKEN_REFRESH_MARGIN:
+        token = auth_manager.refresh_access_token(token["refresh_token"])
+        expires = datetime.fromtimestamp(token["expires_at"]).isoformat(timespec="seconds")
+        logger.info(f"Refreshed Spotify access token (valid until {expires}).")
 
-    sp = Spotify(auth_manager=auth_manager)
-    user = sp.current_user()
-    logger.info(f"Authenticated as: {user.get('display_name')} ({user.get('id')})")
+    sp = Spotify(auth_manager=auth_manager, requests_session=_build_requests_session())
+    user_key = _user_cache_key(client_id, token)
+    user_id = _load_cached_user_id(user_key) if user_key else None
+    if user_id:
+        logger.info(f"Authenticated as: {user_id} (cached)")
+    else:
+        user = sp.current_user()
+        user_id = user["id"]
+        logger.info(f"Authenticated as: {user.get('display_name')} ({user_id})")
+        # The first /me may have run the login flow, so read the token again
+        user_key = _user_cache_key(client_id, auth_manager.get_cached_token())
+        if user_key:
+            _store_user_id(user_key, user_id)
+
+    expires_at = (auth_manager.get_cached_token() or {}).get("expires_at", 0)
+    _CLIENT_CACHE[cache_path] = (sp, user_id, expires_at)
+    return sp, user_id
+
+
+def create_spotify_client(cache_path: str = ".cache-spotify") -> Spotify:
+    """
+    Creates and returns an authenticated Spotify client instance.
 
+    :param cache_path: Path for the token cache file.
+    :return: Authenticated spotipy.Spotify instance.
+    """
+    sp, _ = _get_or_build(cache_path)
     return sp
 
 def get_spotify_client_and_user_id(cache_path: str = ".cache-spotify") -> tuple[Spotify, str]:
@@ -59,30 +271,32 @@ def get_spotify_client_and_user_id(cache_path: str = ".cache-spotify") -> tuple[
     :param cache_path: Pfad zur Token-Cache-Datei.
     :return: Tuple aus Spotify-Client und User-ID.
     """
-    setup_logger(level="INFO")
-    logger = logging.getLogger(__name__)
+    return _get_or_build(cache_path)
 
-    client_id = os.getenv("SPOTIPY_CLIENT_ID")
-    client_secret = os.getenv("SPOTIPY_CLIENT_SECRET")
-    redirect_uri = os.getenv("SPOTIPY_REDIRECT_URI", SPOTIFY_REDIRECT_URI)
 
-    if not all([client_id, client_secret, redirect_uri]):
-        logger.error("Fehlende Spotify-Zugangsdaten oder Redirect URI.")
-        raise EnvironmentError("Spotify-Zugangsdaten nicht korrekt konfiguriert.")
+def call_with_backoff(func: Callable[..., Any], *args: Any, max_attempts: int = 5, **kwargs: Any) -> Any:
+    """
+    Calls a Spotify API function and retries it when Spotify answers with HTTP 429.
 
-    auth_manager = SpotifyOAuth(
-        client_id=client_id,
-        client_secret=client_secret,
-        redirect_uri=redirect_uri,
-        scope=" ".join(SPOTIFY_SCOPES),
-        cache_path=cache_path,
-        open_browser=True,
-    )
+    The wait time is taken from the Retry-After header and applies to all threads, see
+    _throttle(). A 429 without Retry-After is re-raised at once: Spotipy reports 5xx
+    responses that urllib3 already retried as such a 429, and those are not a rate limit.
 
-    sp = Spotify(auth_manager=auth_manager)
-    user_id = sp.current_user()["id"]
-    logger.info(f"Authentifiziert als User-ID: {user_id}")
-    return sp, user_id
+    :param func: Function performing the API call (e.g. sp_client.search).
+    :param max_attempts: Number of attempts before the error is re-raised.
+    :return: The return value of `func`.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return func(*args, **kwargs)
+        except SpotifyException as e:
+            retry_after = (e.headers or {}).get("Retry-After")
+            if e.http_status != 429 or retry_after is None or attempt == max_attempts:
+                raise
+            retry_after = int(retry_after)
+            logger.warning(f"Rate limited by Spotify, retrying in {retry_after}s ({attempt}/{max_attempts}).")
+            _pause_requests(retry_after)
+            time.sleep(retry_after)
 
 
 if __name__ == "__main__":
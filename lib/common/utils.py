@@ -1,6 +1,15 @@
+import functools
 import re
 import os
+import time
 
+_NON_SLUG_RE = re.compile(r"[^\w\s-]")
+
+# Resolved lineup paths: (festival, year) -> (path or None, monotonic timestamp)
+_lineup_path_cache: dict[tuple[str, str], tuple[str | None, float]] = {}
+
+
+@functools.lru_cache(maxsize=4096)
 def schema_name(festival_key: str, year_val: str) -> str:
     """
     Converts festival key and year to a standardized schema name (e.g., for filenames).
@@ -8,19 +17,23 @@ def schema_name(festival_key: str, year_val: str) -> str:
     return f"{festival_key.strip().lower().replace(' ', '_')}_{year_val}"
 
 
+@functools.lru_cache(maxsize=4096)
 def slug(text: str) -> str:
     """
     Generates a slug from text (only lowercase letters, numbers, and hyphens).
     """
-    s = re.sub(r"[^\w\s-]", "", text.strip().lower())
-    s = re.sub(r"\s+", " ", s)  # Mehrere Leerzeichen zu einem
-    return s.strip() or "unknown"
+    s = text.strip().lower()
+    if not s.isalnum():  # fast path: single words like "wacken" need no cleanup
+        s = " ".join(_NON_SLUG_RE.sub("", s).split())  # Mehrere Leerzeichen zu einem
+    return s or "unknown"
 
 
 def find_lineup_path(festival: str, year: str) -> str | None:
     """
-    Searches for a lineup file (CSV or JSON) for the given festival and year.
+    Searches for a lineup file (JSON or CSV) for the given festival and year.
+    {festival}_{year}.json is preferred over {festival}_{year}.csv.
     Returns the path to the first matching file, or None if not found.
+    Results are cached for LINEUP_PATH_CACHE_TTL seconds.
 
     Args:
         festival (str): Festival name/key.
@@ -29,19 +42,47 @@ def find_lineup_path(festival: str, year: str) -> str | None:
     Returns:
         str | None: Path to the lineup file, or None if not found.
     """
+    from conf.config import LINEUP_PATH_CACHE_TTL
+
+    key = (festival.lower(), str(year))
+    cached = _lineup_path_cache.get(key)
+    if cached and time.monotonic() - cached[1] < LINEUP_PATH_CACHE_TTL:
+        return cached[0]
+
+    path = _resolve_lineup_path(*key)
+    _lineup_path_cache[key] = (path, time.monotonic())
+    return path
+
+
+def clear_lineup_path_cache() -> None:
+    """
+    Forgets all resolved lineup paths (call after writing a new lineup file).
+    """
+    _lineup_path_cache.clear()
+
+
+def _resolve_lineup_path(festival: str, year: str) -> str | None:
+    """
+    Uncached file system lookup behind find_lineup_path.
+    """
     from conf.config import DATA_DIR
 
-    base_dir = os.path.join(DATA_DIR, festival.lower(), str(year))
-    csv_path = os.path.join(base_dir, f"{festival.lower()}_{year}.csv")
-    json_path = os.path.join(base_dir, f"{festival.lower()}_{year}.json")
+    festival = festival.lower()
+    base_dir = os.path.join(DATA_DIR, festival, str(year))
+    csv_path = os.path.join(base_dir, f"{festival}_{year}.csv")
+    json_path = os.path.join(base_dir, f"{festival}_{year}.json")
 
-    if os.path.exists(csv_path):
-        return csv_path
     if os.path.exists(json_path):
         return json_path
+    if os.path.exists(csv_path):
+        return csv_path
 
-    if os.path.isdir(base_dir):
-        for f in os.listdir(base_dir):
-            if f.lower().endswith((".csv", ".json")):
-                return os.path.join(base_dir, f)
-    return None
\ No newline at end of file
+    # Any other lineup file; DirEntry caches the file type, so no extra stat per entry
+    try:
+        with os.scandir(base_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith((".csv", ".json")):
+                    return entry.path
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return None
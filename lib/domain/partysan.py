@@ -3,6 +3,7 @@
 import requests
 from bs4 import BeautifulSoup
 import logging
+from lib.common.http_session import SESSION
 
 
 def fetch_lineup(url: str = "https://www.party-san.de/bands-2026") -> list[str]:
@@ -16,7 +17,7 @@ def fetch_lineup(url: str = "https://www.party-san.de/bands-2026") -> list[str]:
     logger.info(f"Fetching Party.San lineup from {url}")
 
     try:
-        response = requests.get(url, timeout=15)
+        response = SESSION.get(url, timeout=15)
         response.raise_for_status()
     except requests.RequestException as e:
         logger.error(f"Request failed: {e}")
@@ -43,7 +44,7 @@ def fetch_lineup(url: str = "https://www.party-san.de/bands-2026") -> list[str]:
                 if text and len(text) > 1:
                     lineup.append(text)
 
-    lineup = sorted(set(lineup))
+    lineup = list(dict.fromkeys(lineup))
     logger.info(f"Fetched {len(lineup)} artists from Party.San page.")
     return lineup
 
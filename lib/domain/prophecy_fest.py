@@ -1,6 +1,7 @@
 import requests
-import re
+from bs4 import BeautifulSoup
 import logging
+from lib.common.http_session import SESSION
 
 def fetch_lineup(url: str = "https://fest.prophecy.de/programme/") -> list[str]:
     """
@@ -13,24 +14,27 @@ def fetch_lineup(url: str = "https://fest.prophecy.de/programme/") -> list[str]:
     logger.info(f"Fetching Prophecy Fest lineup from {url}")
 
     try:
-        response = requests.get(url, timeout=15)
+        response = SESSION.get(url, timeout=15)
         response.raise_for_status()
     except requests.RequestException as e:
         logger.error(f"Request failed: {e}")
         return []
 
-    html = response.text
-    pattern = r'<div class="et_pb_text_inner">\s*<h3>\s*(.*?)\s*</h3>\s*</div>'
-    artists = [a.strip() for a in re.findall(pattern, html, re.IGNORECASE | re.DOTALL) if a.strip()]
+    soup = BeautifulSoup(response.text, "lxml")
 
-    # Remove entries with line breaks (multiple bands or info text)
-    artists = [a for a in artists if "\n" not in a]
+    # Each band name sits alone in <div class="et_pb_text_inner"><h3>NAME</h3></div>;
+    # entries with line breaks (multiple bands or info text) are skipped
+    artists = [
+        name
+        for h3 in soup.select("div.et_pb_text_inner > h3:only-child")
+        if (name := h3.get_text("\n", strip=True)) and "\n" not in name
+    ]
 
     # Remove last entry if it contains "PROPHECY FEST" (info text)
     if artists and "PROPHECY FEST" in artists[-1].upper():
         artists.pop()
 
-    artists = sorted(set(artists))
+    artists = list(dict.fromkeys(artists))
     logger.info(f"Fetched {len(artists)} artists from Prophecy Fest page.")
     return artists
 
@@ -1,5 +1,5 @@
-import re
 from pathlib import Path
+from lxml import html as lxml_html
 
 def parse_summerbreeze_lineup(html_path: str | Path) -> list[str]:
     """
@@ -10,9 +10,9 @@ def parse_summerbreeze_lineup(html_path: str | Path) -> list[str]:
     if not html_path.exists():
         raise FileNotFoundError(f"Datei nicht gefunden: {html_path}")
 
-    html = html_path.read_text(encoding="utf-8")
-    bands = re.findall(r'<h3 class="teaser__title">\s*(.*?)\s*</h3>', html, re.IGNORECASE)
-    return [b.strip() for b in bands if b.strip()]
+    root = lxml_html.fromstring(html_path.read_text(encoding="utf-8"))
+    bands = [h3.text_content().strip() for h3 in root.xpath('//h3[@class="teaser__title"]')]
+    return [b for b in bands if b]
 
 def main():
     # Beispiel: Bands aus einer HTML-Datei extrahieren und ausgeben
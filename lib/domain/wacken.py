@@ -9,13 +9,13 @@ Example:
     python3 -m lib.domain.wacken
 """
 
+import logging
 import requests
-import json
-from lib.common.logger import setup_logger, get_logger
+from lib.common.http_session import SESSION
+from lib.common.json_utils import loads as json_loads
+from lib.common.logger import setup_logger
 
-# Initialize logger early
-setup_logger(level="INFO", log_dir="logs")
-logger = get_logger(__name__)
+logger = logging.getLogger(__name__)
 
 def fetch_wacken_lineup() -> list[str]:
     """
@@ -29,19 +29,19 @@ def fetch_wacken_lineup() -> list[str]:
     logger.info(f"Fetching Wacken lineup from {url}")
 
     try:
-        response = requests.get(url, timeout=10)
+        response = SESSION.get(url, timeout=10)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to fetch Wacken lineup: {e}")
         return []
 
     try:
-        data = response.json()
-    except json.JSONDecodeError as e:
+        data = json_loads(response.content)
+    except ValueError as e:
         logger.error(f"Failed to parse JSON response: {e}")
         return []
 
-    bands = [entry["artist"]["title"].strip() for entry in data if "artist" in entry and "title" in entry["artist"]]
+    bands = [title.strip() for entry in data if (title := (entry.get("artist") or {}).get("title"))]
     logger.info(f"Successfully parsed {len(bands)} bands from Wacken JSON")
 
     # Optional preview
@@ -55,6 +55,7 @@ def fetch_wacken_lineup() -> list[str]:
 fetch_lineup = fetch_wacken_lineup
 
 if __name__ == "__main__":
+    setup_logger(level="INFO", log_dir="logs")
     bands = fetch_wacken_lineup()
     print(f"\nFound {len(bands)} bands:\n")
     for band in bands:
@@ -0,0 +1,32 @@
+"""
+Debug helper: lists all playlists of the authenticated user and removes
+every playlist whose name starts with the Festify prefix.
+
+Example:
+    python3 -m scr.debug_list_playlists
+"""
+
+from lib.common.spotify_client import get_spotify_client_and_user_id
+from lib.common.playlist_manager import list_all_playlists, delete_playlists_by_prefix
+
+
+def main() -> None:
+    sp, user_id = get_spotify_client_and_user_id()
+    prefix = "Festify ·"
+
+    # Debug-Ausgabe: Zeige alle Playlists mit Name, Owner und ID
+    playlists = list_all_playlists(sp)
+    print(f"Gefundene Playlists: {len(playlists)}")
+    for pl in playlists:
+        name = pl.get("name", "")
+        pid = pl.get("id")
+        owner = pl.get("owner", {}).get("id")
+        print(f"Name='{name}', Owner='{owner}', ID='{pid}'")
+
+    # Löschen der Playlists mit passendem Prefix
+    deleted = delete_playlists_by_prefix(sp, user_id, prefix)
+    print(f"Entfernte {deleted} Playlists mit Prefix '{prefix}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ Supports:
     --quiet   → suppress console logs, keep progress bar
     --export  → export normalized lineup
     --generate_playlist → trigger Spotify playlist generator
+    --no_cache → ignore cached Spotify artist lookups (they are refreshed)
+    --refresh_lineup → re-scrape the lineup if the local file is older than SCRAPER_TTL
     --delete_old_playlists → löscht alle alten Festify-Playlists vor dem Neuaufbau
 """
 
@@ -19,16 +21,139 @@ import argparse
 import importlib
 import logging
 import os
-import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
-from conf.config import DEFAULT_TOP_N, DATA_DIR, LOG_DIR
+from conf.config import DEFAULT_TOP_N, DATA_DIR, LOG_DIR, SCRAPER_TTL
 from lib.common.logger import setup_logger
 from lib.common.lineup_loader import fetch_lineup
 from lib.common.export_utils import export_playlist
+from lib.common.json_utils import dumps as json_dumps
 from lib.common.spotify_client import get_spotify_client_and_user_id
 from lib.common.playlist_manager import delete_playlists_by_prefix, generate_festival_playlist
-from lib.common.utils import schema_name, slug, find_lineup_path
+from lib.common.utils import schema_name, slug, find_lineup_path, clear_lineup_path_cache
+
+# ---------------------------------------------------------------------------
+# Scraper fallback
+# ---------------------------------------------------------------------------
+
+def _auto_fetch_from_scraper(festival: str, year: str) -> str | None:
+    """
+    Scrapes a lineup via lib.domain.{festival} and stores it under res/lineups/{festival}/{year}/.
+    A previously scraped file younger than SCRAPER_TTL is reused without touching the network.
+
+    :param festival: Festival key, equal to the scraper module name (e.g. "partysan").
+    :param year: Festival year.
+    :return: Path of the written lineup JSON, or None if no scraper exists or it found nothing.
+    """
+    logger = logging.getLogger(__name__)
+    festival_key = festival.lower()
+    output_dir = os.path.join(DATA_DIR, festival_key, str(year))
+    output_path = os.path.join(output_dir, f"{festival_key}_{year}.json")
+
+    try:
+        age = time.time() - os.path.getmtime(output_path)
+    except OSError:
+        age = None
+    if age is not None and age < SCRAPER_TTL:
+        logger.info(f"Scraped lineup for {festival} {year} is {age / 60:.0f} min old, reusing {output_path}")
+        return output_path
+
+    module_name = f"lib.domain.{festival_key}"
+    try:
+        if not festival_key.isidentifier():
+            raise ModuleNotFoundError(module_name, name=module_name)
+        scraper = importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        # Only a missing scraper module; a broken scraper (e.g. missing bs4) must not be hidden
+        if e.name != module_name:
+            raise
+        logger.error(f"No scraper available for festival '{festival}'.")
+        return None
+
+    fetch = getattr(scraper, "fetch_lineup", None)
+    if not callable(fetch):
+        logger.error(f"Scraper module for '{festival}' has no fetch_lineup().")
+        return None
+
+    lineup = fetch()
+    if not lineup:
+        logger.warning(f"Scraper for '{festival}' returned no artists.")
+        # Keep using an outdated file rather than failing the run
+        return output_path if age is not None else None
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Write to a temporary file first, so readers never see a half-written lineup
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(json_dumps(lineup))
+    os.replace(tmp_path, output_path)
+
+    clear_lineup_path_cache()
+    logger.info(f"Scraped {len(lineup)} artists for {festival} {year} → {output_path}")
+    return output_path
+
+
+# ---------------------------------------------------------------------------
+# Festival processing
+# ---------------------------------------------------------------------------
+
+def process_festival(festival: str, args: argparse.Namespace, sp_client, user_id) -> None:
+    """
+    Loads, optionally exports, and optionally turns one festival lineup into a playlist.
+
+    :param festival: Festival key (e.g. "wacken").
+    :param args: Parsed command line arguments.
+    :param sp_client: Authenticated Spotipy client (None if Spotify is not needed).
+    :param user_id: Spotify user ID (None if Spotify is not needed).
+    """
+    logger = logging.getLogger(__name__)
+    lineup_path = None if args.refresh_lineup else find_lineup_path(festival=festival, year=args.year)
+    if not lineup_path:
+        # With --refresh_lineup, a manually maintained file still serves festivals without a scraper
+        lineup_path = (_auto_fetch_from_scraper(festival=festival, year=args.year)
+                       or find_lineup_path(festival=festival, year=args.year))
+    if not lineup_path:
+        logger.error(f"No lineup found for {festival} {args.year}, skipping.")
+        return
+
+    logger.info(f"Using lineup file: {lineup_path}")
+
+    lineup = fetch_lineup(file_path=lineup_path)
+    if not lineup or lineup == ["(empty lineup placeholder)"]:
+        logger.warning("No valid artists found (placeholder or empty lineup in use).")
+
+    playlist_title = f"Festify · {schema_name(festival_key=festival, year_val=args.year)}"
+    logger.info(f"Detected festival='{festival}', year='{args.year}' → Playlist name: '{playlist_title}'")
+    logger.info(f"Artists loaded: {len(lineup)}")
+
+    if args.export:
+        export_playlist(
+            playlist_name=playlist_title,
+            data=[{"artist": name} for name in lineup],
+            export_dir=DATA_DIR,
+            is_lineup=True,
+            festival_slug=slug(text=festival),
+            year=args.year,
+        )
+        logger.info(f"Exported normalized lineup for {festival} {args.year}.")
+
+    if args.generate_playlist and sp_client and user_id:
+        playlist_title, new_tracks = generate_festival_playlist(
+            sp_client=sp_client,
+            user_id=user_id,
+            lineup=lineup,
+            festival_name=festival,
+            year=args.year,
+            top_n=DEFAULT_TOP_N,
+            export_dir=DATA_DIR,
+            quiet=args.quiet,
+            use_cache=not args.no_cache
+        )
+        logger.info(f"Generated playlist '{playlist_title}' with {new_tracks} new tracks.")
+
 
 # ---------------------------------------------------------------------------
 # Main
@@ -41,6 +166,10 @@ def main() -> None:
     parser.add_argument("--export", action="store_true", help="Export normalized lineup to res/lineups/.")
     parser.add_argument("--generate_playlist", action="store_true",
                         help="Trigger Spotify playlist generation after fetching lineup.")
+    parser.add_argument("--refresh_lineup", action="store_true",
+                        help="Re-scrape the lineup even if a local file exists (reused if younger than SCRAPER_TTL).")
+    parser.add_argument("--no_cache", action="store_true",
+                        help="Ignore cached Spotify artist lookups and fetch them again.")
     parser.add_argument("--log_level", default="INFO", help="Logging level (default: INFO).")
     parser.add_argument("--quiet", action="store_true",
                         help="Suppress all console logs (keep progress bar visible).")
@@ -60,45 +189,12 @@ def main() -> None:
         removed = delete_playlists_by_prefix(sp_client, user_id, "Festify")
         logger.info(f"Entfernt {removed} alte Festify-Playlists.")
 
-    for festival in args.festival:
-        lineup_path = find_lineup_path(festival=festival, year=args.year)
-
-        logger.info(f"Using lineup file: {lineup_path}")
-
-        lineup = fetch_lineup(file_path=lineup_path)
-        if not lineup or lineup == ["(empty lineup placeholder)"]:
-            logger.warning("No valid artists found (placeholder or empty lineup in use).")
-
-        playlist_title = f"Festify · {schema_name(festival_key=festival, year_val=args.year)}"
-        logger.info(f"Detected festival='{festival}', year='{args.year}' → Playlist name: '{playlist_title}'")
-        logger.info(f"Artists loaded: {len(lineup)}")
-
-        if args.export:
-            export_playlist(
-                playlist_name=playlist_title,
-                data=[{"artist": name} for name in lineup],
-                export_dir=DATA_DIR,
-                is_lineup=True,
-                festival_slug=slug(text=festival),
-                year=args.year,
-            )
-            logger.info(f"Exported normalized lineup for {festival} {args.year}.")
-
-        if args.generate_playlist and sp_client and user_id:
-            playlist_title, new_tracks = generate_festival_playlist(
-                sp_client=sp_client,
-                user_id=user_id,
-                lineup=lineup,
-                festival_name=festival,
-                year=args.year,
-                top_n=DEFAULT_TOP_N,
-                export_dir=DATA_DIR,
-                quiet=args.quiet
-            )
-            logger.info(f"Generated playlist '{playlist_title}' with {new_tracks} new tracks.")
-
-            if args.quiet:
-                sys.argv.append("--quiet")
+    # A festival given twice (in any case) would update the same playlist from two threads
+    festivals = list(dict.fromkeys(festival.lower() for festival in args.festival))
+
+    # Festivals are independent and mostly wait on network I/O, so process them in parallel
+    with ThreadPoolExecutor(max_workers=min(8, len(festivals))) as executor:
+        list(executor.map(lambda festival: process_festival(festival, args, sp_client, user_id), festivals))
 
 if __name__ == "__main__":
     main()
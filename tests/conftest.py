@@ -0,0 +1,57 @@
+"""Shared fixtures: an in-memory stand-in for the Spotipy client."""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, List
+
+import pytest
+
+from lib.common import playlist_manager
+
+
+class FakeSpotify:
+    """Implements the few Spotipy methods the project uses and counts every call."""
+
+    def __init__(self, user_id: str = "me") -> None:
+        self.user_id = user_id
+        self.playlists: List[Dict[str, Any]] = []
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+
+    def add_playlist(self, name: str, owner: str | None = None) -> Dict[str, Any]:
+        self._next_id += 1
+        pl = {"id": f"pl{self._next_id}", "name": name, "owner": {"id": owner or self.user_id}, "description": ""}
+        self.playlists.append(pl)
+        return pl
+
+    def current_user_playlists(self, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        self._count("current_user_playlists")
+        return {"items": self.playlists[offset:offset + limit]}
+
+    def user_playlist_create(self, user: str, name: str, public: bool = True, description: str = "") -> Dict[str, Any]:
+        self._count("user_playlist_create")
+        return self.add_playlist(name, owner=user)
+
+    def current_user_unfollow_playlist(self, playlist_id: str) -> None:
+        self._count("current_user_unfollow_playlist")
+        self.playlists = [pl for pl in self.playlists if pl["id"] != playlist_id]
+
+
+@pytest.fixture
+def fake_sp() -> FakeSpotify:
+    return FakeSpotify()
+
+
+@pytest.fixture(autouse=True)
+def _reset_playlist_cache():
+    # The playlist caches are keyed by id(sp_client), which may be reused between tests
+    playlist_manager._playlist_cache.clear()
+    playlist_manager._playlists_by_name.clear()
+    yield
+    playlist_manager._playlist_cache.clear()
+    playlist_manager._playlists_by_name.clear()
@@ -0,0 +1,96 @@
+import pytest
+
+from conf.config import ARTIST_CACHE_TTL, TOP_TRACKS_CACHE_TTL
+from lib.common import artist_cache as ac
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch, tmp_path):
+    fake = FakeClock()
+    monkeypatch.setattr(ac, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(ac, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    calls = []
+
+    def fake_get_artist_id(sp_client, name):
+        calls.append(name)
+        return None if name == "Nobody" else f"id-{name}"
+
+    monkeypatch.setattr(ac, "get_artist_id", fake_get_artist_id)
+    return calls
+
+
+def test_artist_id_is_cached_until_ttl(clock, searches):
+    assert ac.get_or_fetch_artist_id(None, "Heaven Shall Burn") == "id-Heaven Shall Burn"
+    clock.now += ARTIST_CACHE_TTL - 1
+    # Lookups are keyed by the normalized name
+    assert ac.get_or_fetch_artist_id(None, "heaven shall burn") == "id-Heaven Shall Burn"
+    assert searches == ["Heaven Shall Burn"]
+
+    clock.now += 1
+    ac.get_or_fetch_artist_id(None, "Heaven Shall Burn")
+    assert searches == ["Heaven Shall Burn", "Heaven Shall Burn"]
+
+
+def test_unknown_artist_is_cached_as_null(clock, searches):
+    assert ac.get_or_fetch_artist_id(None, "Nobody") is None
+    assert ac.get_or_fetch_artist_id(None, "Nobody") is None
+    assert searches == ["Nobody"]
+
+
+def test_top_tracks_are_cached_once_for_every_limit(clock, monkeypatch):
+    calls = []
+
+    def fake_get_top_tracks(sp_client, artist_id, limit, market):
+        calls.append((artist_id, limit, market))
+        return [
+            {"id": f"t{i}", "name": f"Track {i}", "external_urls": {}, "popularity": 50}
+            for i in range(limit)
+        ]
+
+    monkeypatch.setattr(ac, "get_top_tracks", fake_get_top_tracks)
+
+    assert [t["id"] for t in ac.get_or_fetch_top_tracks(None, "a1", limit=3)] == ["t0", "t1", "t2"]
+    assert len(ac.get_or_fetch_top_tracks(None, "a1", limit=5)) == 5
+    # Only the fields the playlist code uses are stored
+    assert set(ac.get_or_fetch_top_tracks(None, "a1", limit=1)[0]) == {"id", "name", "external_urls"}
+    assert calls == [("a1", 10, "US")]
+
+    clock.now += TOP_TRACKS_CACHE_TTL
+    ac.get_or_fetch_top_tracks(None, "a1", limit=3)
+    assert len(calls) == 2
+
+
+def test_use_cache_false_fetches_again_and_overwrites(clock, searches, monkeypatch):
+    ac.get_or_fetch_artist_id(None, "Behemoth")
+    monkeypatch.setattr(ac, "get_artist_id", lambda sp_client, name: searches.append(name) or "id-new")
+
+    assert ac.get_or_fetch_artist_id(None, "Behemoth", use_cache=False) == "id-new"
+    # The refreshed entry is what later cached lookups return
+    assert ac.get_or_fetch_artist_id(None, "Behemoth") == "id-new"
+    assert searches == ["Behemoth", "Behemoth"]
+
+
+def test_festival_tracks_round_trip(clock, tmp_path):
+    assert ac.load_festival_tracks("wacken", "2026") == {}
+
+    tracks = {"Behemoth": {"top_n": 3, "ids": ["t1", "t2"]}, "Kreator": {"top_n": 3, "ids": []}}
+    ac.save_festival_tracks("wacken", "2026", tracks)
+    assert ac.load_festival_tracks("wacken", "2026") == tracks
+    assert ac.load_festival_tracks("wacken", "2025") == {}
+
+    # An unreadable file is ignored rather than failing the run
+    (tmp_path / "festival_wacken_2026.json").write_text("{not json", encoding="utf-8")
+    assert ac.load_festival_tracks("wacken", "2026") == {}
@@ -0,0 +1,12 @@
+from conf import config
+
+
+def test_env_int_falls_back_on_invalid_values(monkeypatch):
+    monkeypatch.setenv("FESTIFY_PARALLEL", "4")
+    assert config._env_int("FESTIFY_PARALLEL", 8) == 4
+
+    monkeypatch.setenv("FESTIFY_PARALLEL", "four")
+    assert config._env_int("FESTIFY_PARALLEL", 8) == 8
+
+    monkeypatch.delenv("FESTIFY_PARALLEL")
+    assert config._env_int("FESTIFY_PARALLEL", 8) == 8
@@ -0,0 +1,53 @@
+import pytest
+
+from lib.common.lineup_loader import fetch_lineup
+
+
+def test_csv_lineup_uses_artist_column(tmp_path):
+    path = tmp_path / "lineup.csv"
+    path.write_text("day,artist\nFri, Heaven Shall Burn \nSat,\nSun\nSun,\"Behemoth, live\"\n", encoding="utf-8")
+
+    # Blank cells and short rows are skipped; quoted commas stay part of the name
+    assert fetch_lineup(str(path)) == ["Heaven Shall Burn", "Behemoth, live"]
+
+
+def test_csv_lineup_without_artist_column(tmp_path):
+    path = tmp_path / "lineup.csv"
+    path.write_text("band\nBehemoth\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        fetch_lineup(str(path))
+
+
+def test_missing_and_unsupported_lineup_files(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        fetch_lineup(str(tmp_path / "missing.csv"))
+
+    path = tmp_path / "lineup.txt"
+    path.write_text("Behemoth\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        fetch_lineup(str(path))
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ('[{"artist": " Behemoth "}, {"artist": ""}, {"artist": "Kreator"}]', ["Behemoth", "Kreator"]),
+        ('["Behemoth", "", " Kreator"]', ["Behemoth", "Kreator"]),
+        ("[]", []),
+    ],
+)
+def test_json_lineup_layouts(tmp_path, content, expected):
+    path = tmp_path / "lineup.json"
+    path.write_text(content, encoding="utf-8")
+
+    assert fetch_lineup(str(path)) == expected
+
+
+@pytest.mark.parametrize("content", ['{"artist": "Behemoth"}', "[1, 2]"])
+def test_invalid_json_lineup(tmp_path, content):
+    path = tmp_path / "lineup.json"
+    path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        fetch_lineup(str(path))
@@ -0,0 +1,162 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lib.common import playlist_manager as pm
+
+
+def test_playlist_listing_is_paged_once(fake_sp):
+    fake_sp.add_playlist("Festify · Wacken 2026")
+    fake_sp.add_playlist("Private Mix")
+
+    assert pm.find_playlist_by_name(fake_sp, "me", "Private Mix")["id"] == "pl2"
+    assert pm.find_playlist_by_name(fake_sp, "me", "Festify · Partysan 2026") is None
+
+    created = pm.create_playlist(fake_sp, "me", "Festify · Partysan 2026", "description")
+    assert pm.find_playlist_by_name(fake_sp, "me", "Festify · Partysan 2026") is created
+
+    assert pm.delete_playlists_by_prefix(fake_sp, "me", "Festify") == 2
+    assert pm.find_playlist_by_name(fake_sp, "me", "Festify · Wacken 2026") is None
+    assert [pl["name"] for pl in pm.list_all_playlists(fake_sp)] == ["Private Mix"]
+    # Create and delete kept the cache in sync; the library was listed only once
+    assert fake_sp.calls["current_user_playlists"] == 1
+
+
+def test_name_index_after_delete_and_recreate(fake_sp):
+    old = fake_sp.add_playlist("Festify · Wacken 2026")
+    fake_sp.add_playlist("Festify · Wacken 2026", owner="someone-else")
+    fake_sp.add_playlist("Private Mix")
+
+    assert pm.find_playlist_by_name(fake_sp, "me", "Festify · Wacken 2026") is old
+
+    assert pm.delete_playlists_by_prefix(fake_sp, "me", "Festify") == 1
+    assert pm.find_playlist_by_name(fake_sp, "me", "Festify · Wacken 2026") is None
+    # Playlists of other owners stay indexed under their own key
+    assert pm.find_playlist_by_name(fake_sp, "someone-else", "Festify · Wacken 2026") is not None
+
+    new = pm.ensure_playlist(fake_sp, "me", "Festify · Wacken 2026", "description")
+    assert new["id"] != old["id"]
+    assert pm.find_playlist_by_name(fake_sp, "me", "Festify · Wacken 2026") is new
+    assert [pl["name"] for pl in pm.list_all_playlists(fake_sp)].count("Festify · Wacken 2026") == 2
+    assert fake_sp.calls["current_user_playlists"] == 1
+
+
+def test_name_index_falls_back_to_duplicate_after_delete(fake_sp):
+    first = fake_sp.add_playlist("Mix")
+    second = fake_sp.add_playlist("Mix")
+    pm.list_all_playlists(fake_sp)
+
+    pm._forget_playlist(fake_sp, first)
+
+    assert pm.find_playlist_by_name(fake_sp, "me", "Mix") is second
+
+
+def test_list_all_playlists_returns_copy(fake_sp):
+    fake_sp.add_playlist("Mix")
+
+    pm.list_all_playlists(fake_sp).clear()
+
+    assert [pl["name"] for pl in pm.list_all_playlists(fake_sp)] == ["Mix"]
+
+
+def _process_concurrently(sp, artists, top_cache):
+    with ThreadPoolExecutor(max_workers=len(artists)) as executor:
+        futures = [executor.submit(pm._process_artist, sp, artist, 3, True, top_cache) for artist in artists]
+        return futures
+
+
+def test_aliases_resolving_to_one_artist_share_one_top_tracks_lookup(monkeypatch, fake_sp):
+    calls = []
+
+    def fake_top_tracks(sp_client, artist_id, limit, use_cache):
+        calls.append(artist_id)
+        time.sleep(0.1)  # keep the owner busy while the other workers arrive
+        return [{"id": f"{artist_id}_t{i}"} for i in range(limit)]
+
+    monkeypatch.setattr(pm, "get_or_fetch_artist_id", lambda sp_client, name, use_cache: "same-id")
+    monkeypatch.setattr(pm, "get_or_fetch_top_tracks", fake_top_tracks)
+
+    futures = _process_concurrently(fake_sp, ["Alias A", "Alias B", "Alias C", "Alias D"], {})
+
+    results = [f.result() for f in futures]
+    assert calls == ["same-id"]
+    assert all(r == results[0] for r in results)
+    assert [t["id"] for t in results[0]] == ["same-id_t0", "same-id_t1", "same-id_t2"]
+
+
+def test_owner_exception_reaches_waiting_callers(monkeypatch, fake_sp):
+    owner_started = threading.Event()
+    calls = []
+
+    def failing_top_tracks(sp_client, artist_id, limit, use_cache):
+        calls.append(artist_id)
+        owner_started.set()
+        time.sleep(0.1)
+        raise RuntimeError("top tracks failed")
+
+    monkeypatch.setattr(pm, "get_or_fetch_artist_id", lambda sp_client, name, use_cache: "same-id")
+    monkeypatch.setattr(pm, "get_or_fetch_top_tracks", failing_top_tracks)
+
+    top_cache = {}
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        owner = executor.submit(pm._process_artist, fake_sp, "Alias A", 3, True, top_cache)
+        owner_started.wait(timeout=5)
+        waiters = [executor.submit(pm._process_artist, fake_sp, name, 3, True, top_cache) for name in ("B", "C")]
+
+        for future in [owner, *waiters]:
+            with pytest.raises(RuntimeError, match="top tracks failed"):
+                future.result()
+    assert calls == ["same-id"]
+
+
+def test_unknown_artist_skips_top_tracks(monkeypatch, fake_sp):
+    monkeypatch.setattr(pm, "get_or_fetch_artist_id", lambda sp_client, name, use_cache: None)
+    monkeypatch.setattr(pm, "get_or_fetch_top_tracks", lambda **kwargs: pytest.fail("unexpected lookup"))
+
+    assert pm._process_artist(fake_sp, "Nobody", 3, True, {}) == []
+
+
+@pytest.mark.parametrize(
+    "entry, top_n, expected",
+    [
+        ({"top_n": 3, "ids": ["a", "b", "c"]}, 3, True),
+        # An artist with fewer top tracks than requested is still complete
+        ({"top_n": 3, "ids": ["a", "b"]}, 3, True),
+        ({"top_n": 5, "ids": ["a", "b"]}, 3, True),
+        # Fetched with a smaller top_n: there may be more tracks to add
+        ({"top_n": 2, "ids": ["a", "b"]}, 3, False),
+        # A track missing from the playlist
+        ({"top_n": 3, "ids": ["a", "b", "x"]}, 3, False),
+        # Plain ID lists of older cache files
+        (["a", "b", "c"], 3, True),
+        (["a", "b"], 3, False),
+    ],
+)
+def test_is_complete(entry, top_n, expected):
+    assert pm._is_complete(entry, top_n, frozenset({"a", "b", "c"})) is expected
+
+
+def test_spotify_error_skips_only_that_artist(monkeypatch, fake_sp):
+    from spotipy.exceptions import SpotifyException
+
+    def flaky_artist_id(sp_client, name, use_cache):
+        if name == "Broken":
+            raise SpotifyException(500, -1, "server error")
+        return f"id-{name}"
+
+    def top_tracks(sp_client, artist_id, limit, use_cache):
+        if artist_id == "id-Alias":
+            raise SpotifyException(502, -1, "bad gateway")
+        return [{"id": f"{artist_id}_t0"}]
+
+    monkeypatch.setattr(pm, "get_or_fetch_artist_id", flaky_artist_id)
+    monkeypatch.setattr(pm, "get_or_fetch_top_tracks", top_tracks)
+
+    top_cache = {}
+    assert pm._process_artist(fake_sp, "Broken", 3, True, top_cache) == []
+    assert pm._process_artist(fake_sp, "Alias", 3, True, top_cache) == []
+    # A second lineup entry sharing the failed lookup is skipped as well
+    assert pm._process_artist(fake_sp, "Alias", 3, True, top_cache) == []
+    assert pm._process_artist(fake_sp, "Behemoth", 3, True, top_cache) == [{"id": "id-Behemoth_t0"}]
@@ -0,0 +1,180 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lib.common import spotify_client as sc
+
+
+class FakeClock:
+    """Replaces the time module in spotify_client: sleep() advances monotonic() instantly."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(sc, "time", fake)
+    monkeypatch.setattr(sc, "_recent_calls", deque())
+    monkeypatch.setattr(sc, "_paused_until", 0.0)
+    monkeypatch.setattr(sc, "SPOTIFY_MAX_CALLS_PER_SECOND", 3)
+    return fake
+
+
+def test_throttle_allows_limit_per_window(clock):
+    for _ in range(3):
+        sc._throttle()
+    assert clock.sleeps == []
+
+    sc._throttle()
+    assert clock.sleeps == [pytest.approx(1.0)]
+    assert clock.now == pytest.approx(1001.0)
+
+
+def test_throttle_window_slides(clock):
+    sc._throttle()
+    clock.now += 0.6
+    sc._throttle()
+    sc._throttle()
+
+    # The oldest call leaves the window 0.4 s later; only then is there room again
+    sc._throttle()
+    assert clock.sleeps == [pytest.approx(0.4)]
+
+
+def test_pause_requests_holds_back_all_calls(clock):
+    sc._pause_requests(5)
+    sc._throttle()
+    assert sum(clock.sleeps) == pytest.approx(5)
+
+    # A shorter pause never shortens a longer one that is still running
+    sc._pause_requests(10)
+    sc._pause_requests(1)
+    sc._throttle()
+    assert sum(clock.sleeps) == pytest.approx(15)
+
+
+def test_call_with_backoff_pauses_on_429(clock):
+    from spotipy.exceptions import SpotifyException
+
+    attempts = []
+
+    def rate_limited_once():
+        attempts.append(clock.now)
+        if len(attempts) == 1:
+            raise SpotifyException(429, -1, "rate limited", headers={"Retry-After": "7"})
+        return "ok"
+
+    assert sc.call_with_backoff(rate_limited_once) == "ok"
+    assert clock.sleeps == [7]
+    assert sc._paused_until == pytest.approx(attempts[0] + 7)
+
+
+def test_call_with_backoff_reraises_other_errors(clock):
+    from spotipy.exceptions import SpotifyException
+
+    def not_found():
+        raise SpotifyException(404, -1, "not found")
+
+    with pytest.raises(SpotifyException):
+        sc.call_with_backoff(not_found)
+    assert clock.sleeps == []
+
+
+
+def test_call_with_backoff_reraises_429_without_retry_after(clock):
+    from spotipy.exceptions import SpotifyException
+
+    attempts = []
+
+    def retries_exhausted():
+        # What Spotipy raises once urllib3 has given up on a 5xx response
+        attempts.append(clock.now)
+        raise SpotifyException(429, -1, "/v1/search:\n Max Retries", headers=None)
+
+    with pytest.raises(SpotifyException):
+        sc.call_with_backoff(retries_exhausted)
+    assert len(attempts) == 1
+    assert clock.sleeps == []
+    assert sc._paused_until == 0.0
+
+class FakeAuthManager:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get_access_token(self, as_dict: bool = True):
+        self.calls += 1
+        time.sleep(0.1)  # real time: the other threads must arrive while this one is busy
+        return {"access_token": f"token-{self.calls}"}
+
+
+def test_single_flight_token_shares_one_refresh():
+    auth = FakeAuthManager()
+    sc._single_flight_token(auth, "test-cache")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tokens = list(executor.map(lambda _: auth.get_access_token(as_dict=False), range(8)))
+
+    assert auth.calls == 1
+    assert tokens == [{"access_token": "token-1"}] * 8
+
+    # Once finished, the next caller triggers a new request
+    assert auth.get_access_token(as_dict=False) == {"access_token": "token-2"}
+
+
+def test_single_flight_token_propagates_errors():
+    class FailingAuth:
+        def get_access_token(self):
+            raise RuntimeError("refresh failed")
+
+    auth = FailingAuth()
+    sc._single_flight_token(auth, "test-cache-failing")
+
+    with pytest.raises(RuntimeError, match="refresh failed"):
+        auth.get_access_token()
+    assert not sc._refresh_inflight
+
+
+def test_user_cache_key_follows_the_account():
+    token = {"access_token": "a1", "refresh_token": "refresh-alice"}
+    refreshed = {"access_token": "a2", "refresh_token": "refresh-alice"}
+    other_login = {"access_token": "b1", "refresh_token": "refresh-bob"}
+
+    key = sc._user_cache_key("client", token)
+    assert key == sc._user_cache_key("client", refreshed)
+    assert key != sc._user_cache_key("client", other_login)
+    assert key != sc._user_cache_key("other-client", token)
+    # The refresh token itself never ends up in the cache file
+    assert "refresh-alice" not in key
+
+    assert sc._user_cache_key("client", None) is None
+    assert sc._user_cache_key("client", {"access_token": "a1"}) is None
+
+
+def test_cached_user_id_expires_and_is_pruned(clock, monkeypatch, tmp_path):
+    monkeypatch.setattr(sc, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(sc, "_USER_CACHE_FILE", str(tmp_path / "spotify_user.json"))
+
+    sc._store_user_id("client:alice", "alice")
+    assert sc._load_cached_user_id("client:alice") == "alice"
+    assert sc._load_cached_user_id("client:bob") is None
+
+    clock.now += sc.USER_ID_CACHE_TTL
+    assert sc._load_cached_user_id("client:alice") is None
+
+    sc._store_user_id("client:bob", "bob")
+    assert sc.json_loads((tmp_path / "spotify_user.json").read_bytes()).keys() == {"client:bob"}